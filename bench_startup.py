@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+################################################################################
+#
+# bench_startup.py - measure the startup cost of bgrep.py
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+"""
+Measures the time taken to run bgrep.py on a small file many times in a row,
+which is dominated by the startup cost of the interpreter and of bgrep itself.
+
+Usage: bench_startup.py [num_runs]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+################################################################################
+
+BGREP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    "bgrep.py")
+
+DEFAULT_NUM_RUNS = 200
+
+CASES = (
+    ("python -c pass (baseline)", ("-c", "pass")),
+    ("bgrep PATTERN FILE", (BGREP_PATH, "hello", "{path}")),
+    ("bgrep -b PATTERN FILE", (BGREP_PATH, "-b", "hello", "{path}")),
+)
+
+################################################################################
+
+def main():
+    num_runs = DEFAULT_NUM_RUNS
+    if len(sys.argv) > 1:
+        num_runs = int(sys.argv[1])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "data.bin")
+        with open(path, "wb") as f:
+            f.write(b"\x00\x01hello world\x02\x03" * 64)
+
+        print("{} runs of each case".format(num_runs))
+        for (name, args) in CASES:
+            args = [arg.format(path=path) for arg in args]
+            elapsed = time_runs([sys.executable] + args, num_runs)
+            print("{:<28} {:8.2f} ms/run".format(name,
+                elapsed * 1000.0 / num_runs))
+
+
+def time_runs(args, num_runs):
+    """
+    Runs the given command the given number of times and returns the total
+    number of seconds that elapsed.
+    """
+    start = time.perf_counter()
+    for i in range(num_runs):
+        subprocess.check_call(args, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+################################################################################
+
+if __name__ == "__main__":
+    main()
@@ -21,14 +21,16 @@
 #
 ################################################################################
 
-import argparse
-import glob
 import itertools
-import logging
 import os
-import re
+import stat
 import sys
 
+# NOTE: argparse, glob, and logging are deliberately imported lazily, only when
+# they are actually needed, because importing them accounts for a significant
+# portion of the startup time and bgrep is often invoked many times in a row
+# on small files (e.g. from build scripts)
+
 ################################################################################
 
 VERSION = "1.0.0"
@@ -37,6 +39,12 @@ EXIT_SUCCESS = 0
 EXIT_ERROR = 1
 EXIT_ARGS = 2
 
+# the log levels, whose values are equal to those of the corresponding
+# constants in the logging module, which is not imported until it is needed
+LOG_LEVEL_VERBOSE = 10 # logging.DEBUG
+LOG_LEVEL_NORMAL = 20 # logging.INFO
+LOG_LEVEL_QUIET = 30 # logging.WARNING
+
 ################################################################################
 
 def main(prog=None, args=None, stdout=None, stderr=None, stdin=None):
@@ -74,9 +82,16 @@ def main(prog=None, args=None, stdout=None, stderr=None, stdin=None):
     # make a local copy of args in case we were given an iterator
     args = tuple(args)
 
+    # the common "bgrep PATTERN [path ...]" form, with no options, is handled
+    # without the overhead of importing argparse and creating the parser
+    if is_simple_args(args):
+        app = create_application(pattern=args[0], paths=args[1:],
+            stdout=stdout, stderr=stderr, stdin=stdin)
+        return run_application(app, stderr=stderr)
+
     # parse the command-line arguments
-    arg_parser = ArgumentParser(prog=prog, stdout=stdout, stderr=stderr,
-        stdin=stdin)
+    arg_parser = load_argument_parser()(prog=prog, stdout=stdout,
+        stderr=stderr, stdin=stdin)
     try:
         app = arg_parser.parse_args(args=args)
     except arg_parser.Error as e:
@@ -95,7 +110,18 @@ def main(prog=None, args=None, stdout=None, stderr=None, stdin=None):
     else:
         del arg_parser # free the memory allocated by the argument parser
 
-    # run the application
+    return run_application(app, stderr=stderr)
+
+
+def run_application(app, stderr):
+    """
+    Runs the given application, reporting any error that occurs.
+    *app* must be an instance of BgrepApplication to run.
+    *stderr* must be a file-like object opened in text mode to which to print
+    the error message if running the application fails.
+    Returns EXIT_SUCCESS if the application completed successfully or
+    EXIT_ERROR if it failed.
+    """
     try:
         app.run()
     except app.Error as e:
@@ -104,6 +130,166 @@ def main(prog=None, args=None, stdout=None, stderr=None, stdin=None):
 
     return EXIT_SUCCESS
 
+
+def is_simple_args(args):
+    """
+    Returns whether or not the given command-line arguments are of the simple
+    form "PATTERN [path ...]", with no options, which can be handled without
+    the full-blown ArgumentParser.
+    *args* must be a sequence of strings whose values are the arguments.
+    """
+    if len(args) < 1:
+        return False
+    for arg in args:
+        if arg.startswith("-"):
+            return False
+    return True
+
+
+def create_application(
+        pattern,
+        paths=(),
+        context_after=20,
+        print_byte_offsets=False,
+        log_level=LOG_LEVEL_NORMAL,
+        stdout=None,
+        stderr=None,
+        stdin=None,
+        queries=None,
+    ):
+    """
+    Creates and returns a new instance of BgrepApplication.
+    *pattern* must be a string whose value is the pattern to search for; it
+    will be converted to bytes using ASCII encoding; may be None if *queries*
+    is specified.
+    *paths* must be an iterable of strings whose values are the paths of the
+    files and directories to search; if empty (the default) then standard
+    input is searched.
+    *context_after* and *print_byte_offsets* have the same meaning as the
+    parameters of the same names of BgrepApplication.__init__().
+    *log_level* must be an integer whose value is the log level, such as
+    LOG_LEVEL_NORMAL (the default).
+    *stdout* and *stderr* must be file-like objects opened in text mode to use
+    as the standard output and standard error streams; may be None (the
+    default) to use sys.stdout and sys.stderr, respectively.
+    *stdin* must be a file-like object opened in text mode to use as the
+    standard input stream; may be None (the default).
+    *queries* must be an iterable of BgrepApplication.Query objects, such as
+    those returned from read_queries(), to search for instead of *pattern*; may
+    be None (the default) to search only for *pattern*.
+    """
+    if pattern is not None:
+        pattern = pattern.encode("US-ASCII", errors="ignore")
+
+    if stdin is not None:
+        stdin = stdin.buffer # use the underlying binary stream
+
+    # the logging module is not imported until a message is actually logged
+    logger = LazyLogger(stream=stderr, level=log_level)
+
+    # setup the iterator over the files to search
+    class MyFileIterator(FileIterator):
+        def on_error(self, path, pattern, error):
+            message = "unable to read {}: {}".format(path, error)
+            logger.warning("WARNING: {}".format(message))
+
+    paths = tuple(paths)
+    files = MyFileIterator(paths, default=stdin,
+        default_path="<standard input>")
+
+    # enable print_filenames if more than one file is being searched
+    # or if a path with glob-style wildcards was given
+    num_explicit_paths = len(paths)
+    if num_explicit_paths < 1:
+        print_filenames = False # reading from standard input
+    elif num_explicit_paths > 1:
+        print_filenames = True
+    else:
+        print_filenames = FileIterator.has_glob_magic(paths[0])
+
+    return BgrepApplication(
+        pattern=pattern,
+        files=files,
+        print_filenames=print_filenames,
+        context_after=context_after,
+        print_byte_offsets=print_byte_offsets,
+        stdout=stdout,
+        stdin=stdin,
+        logger=logger,
+        queries=queries,
+    )
+
+
+def read_queries(path, context_after=20):
+    """
+    Reads the queries to search for from a file.
+    Each non-blank line of the file specifies one query and consists of up to
+    three tab-separated fields: the pattern, the number of bytes of context
+    after each match, and the path of the file to which to write the matches.
+    The last two fields are optional; if omitted or empty then the given
+    *context_after* is used as the context length and the matches are written
+    to standard output, respectively; an output path of "-" also denotes
+    standard output.  No two queries may write to the same output, whether it
+    is standard output or a file, so that the matches of different queries are
+    never mixed together.
+    *path* must be a string whose value is the path of the file to read.
+    *context_after* must be an integer whose value is the context length to
+    use for queries that do not specify one; the default is 20.
+    Returns a list of BgrepApplication.Query objects, in the order in which they
+    appear in the file.
+    Raises IOError if reading the file fails or ValueError if the file is
+    malformed.
+    """
+    queries = []
+    output_line_numbers = {} # maps each output to the line that writes to it
+    with open(path) as f:
+        for (line_number, line) in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+
+            fields = line.split("\t")
+            if len(fields) > 3:
+                raise ValueError("line {}: too many fields: {}"
+                    .format(line_number, len(fields)))
+            fields.extend([""] * (3 - len(fields)))
+            (pattern, query_context_after, output_path) = fields
+
+            pattern = pattern.encode("US-ASCII", errors="ignore")
+            if not pattern:
+                raise ValueError("line {}: empty pattern".format(line_number))
+
+            if not query_context_after:
+                query_context_after = context_after
+            else:
+                try:
+                    query_context_after = int(query_context_after)
+                except ValueError:
+                    query_context_after = -1
+                if query_context_after < 0:
+                    raise ValueError("line {}: invalid context length: {}"
+                        .format(line_number, fields[1]))
+
+            # compare the real paths of the output files so that the same file
+            # specified in different ways is detected
+            if output_path in ("", "-"):
+                output_path = None
+                output_key = None
+                output_name = "standard output"
+            else:
+                output_key = os.path.normcase(os.path.realpath(output_path))
+                output_name = "output file {}".format(output_path)
+            if output_key in output_line_numbers:
+                raise ValueError("line {}: {} is already written to by line {}"
+                    .format(line_number, output_name,
+                    output_line_numbers[output_key]))
+            output_line_numbers[output_key] = line_number
+
+            queries.append(BgrepApplication.Query(pattern,
+                context_after=query_context_after, output_path=output_path))
+
+    return queries
+
 ################################################################################
 
 class BgrepApplication:
@@ -112,18 +298,20 @@ class BgrepApplication:
     """
 
     def __init__(self,
-            pattern,
+            pattern=None,
             files=None,
             print_filenames=False,
             context_after=20,
             print_byte_offsets=False,
             stdout=None,
             stdin=None,
-            logger=None
+            logger=None,
+            queries=None,
         ):
         """
         Initializes a new instance of this class.
-        *pattern* must be a byte string whose value to search for.
+        *pattern* must be a byte string whose value to search for; may be None
+        (the default) only if *queries* is specified.
         *files* must be a FileIterator object whose files to search.
         *print_filenames* is evaluated as a boolean; if it evaluates to True
         then each match is prefixed with the name of the file in which it was
@@ -140,44 +328,117 @@ class BgrepApplication:
         *stdin* must be a file-like object opened in *binary* mode to use as the
         standard input stream; may be None (the default) to use
         sys.stdin.buffer.
-        *logger* must be an instance of logging.Logger to which log messages
-        are to be written; may be None (the default) to not emit log messages.
+        *logger* must be an object with debug() and warning() methods, such as
+        an instance of logging.Logger or LazyLogger, to which log messages are
+        to be written; may be None (the default) to not emit log messages.
+        *queries* must be an iterable of Query objects to search for, all of
+        which are searched for during a single pass over the files; may be None
+        (the default) to search only for *pattern*, with *context_after*
+        bytes of context, writing the matches to *stdout*.
         """
-        self.pattern = pattern
+        if queries is None:
+            queries = [self.Query(pattern, context_after=context_after)]
+
+        self.queries = tuple(queries)
         self.files = files
         self.print_filenames = print_filenames
-        self.context_after = context_after
         self.print_byte_offsets = print_byte_offsets
         self.stdout = stdout
         self.stdin = stdin
         self.logger = logger
+        self._outputs = {}
 
 
     def run(self):
         """
-        Iterates over the paths in self.paths and reports to self.stdout any
-        matches of the pattern self.pattern.
+        Iterates over the paths in self.paths and reports any matches of the
+        patterns of self.queries to their respective outputs.
         Raises Error if an error occurs.
         """
-        buffer = None
-        for file_info in self.files:
-            f = file_info.f
-            path = file_info.path
-            pattern = file_info.pattern
-            self.log_debug("Searching {}".format(path))
+        # open the output files without truncating them, so that no data is
+        # lost if one of them turns out to also be one of the files to search
+        outputs = {}
+        try:
+            for query in self.queries:
+                output_path = query.output_path
+                if output_path is not None:
+                    try:
+                        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT
+                            | getattr(os, "O_BINARY", 0), 0o666)
+                        outputs[output_path] = open(fd, "w")
+                    except (IOError, OSError) as e:
+                        raise self.Error("unable to open output file {}: {}"
+                            .format(output_path, e))
+            self._outputs = outputs
+
+            # identify the output files, which also detects different paths,
+            # such as hard links, that refer to the same output file
+            output_file_ids = {}
+            for (output_path, output) in outputs.items():
+                file_id = self._get_file_id(output)
+                if file_id is None:
+                    continue
+                other_output_path = output_file_ids.get(file_id)
+                if other_output_path is not None:
+                    raise self.Error("output files {} and {} are the same file"
+                        .format(other_output_path, output_path))
+                output_file_ids[file_id] = output_path
+
+            # refuse to overwrite a file that was explicitly given to search
+            input_path = self._find_input_file(output_file_ids)
+            if input_path is not None:
+                raise self.Error("input file {} is also an output file"
+                    .format(input_path))
+
+            # truncate the output files, except for those that are not
+            # regular files, such as devices and pipes, which cannot be
             try:
-                buffer = self.search(f, path, buffer=buffer)
-            except IOError as e:
-                self.files.on_error(path, pattern, e)
+                for (output_path, output) in outputs.items():
+                    if stat.S_ISREG(os.fstat(output.fileno()).st_mode):
+                        output.truncate(0)
+            except (IOError, OSError) as e:
+                raise self.Error("unable to write to {}: {}"
+                    .format(output_path, e))
+
+            # files found by walking directories cannot be checked in advance,
+            # so any that are output files are skipped when they are reached
+            buffer = None
+            for file_info in self.files:
+                f = file_info.f
+                path = file_info.path
+                pattern = file_info.pattern
+                if output_file_ids:
+                    if self._get_file_id(f) in output_file_ids:
+                        error = IOError("input file is also an output file")
+                        self.files.on_error(path, pattern, error)
+                        continue
+                self.log_debug("Searching {}".format(path))
+                try:
+                    buffer = self.search(f, path, buffer=buffer)
+                except IOError as e:
+                    self.files.on_error(path, pattern, e)
+        finally:
+            self._outputs = {}
+            close_error = None
+            for (output_path, output) in outputs.items():
+                try:
+                    output.close()
+                except IOError as e:
+                    if close_error is None:
+                        close_error = self.Error("unable to write to {}: {}"
+                            .format(output_path, e))
+            if close_error is not None:
+                raise close_error
 
 
     def search(self, f, path, buffer=None):
         """
-        Searches the given file for this object's pattern.
+        Searches the given file for the patterns of this object's queries.
+        The file is read only once, regardless of the number of queries.
         All matches that are found are reported via on_match_found().
 
         *f* file be a file object opened for binary read to search for this
-        object's pattern.
+        object's patterns.
         *path* must be a string whose value is the path of the given file.
         *buffer* must be a bytearray object that will be used as the read
         buffer; the first invocation of this method should specify None, in
@@ -190,66 +451,148 @@ class BgrepApplication:
         normal file object, then this means that the caller should catch and
         handle IOError.
         """
-
-        # create the buffer if it has not been allocated yet
+        queries = self.queries
+
+        # the number of bytes of each match to report, including the context
+        # after it; a negative context length is treated as zero
+        match_lens = []
+        for query in queries:
+            context_after = query.context_after
+            if context_after < 0:
+                context_after = 0
+            match_lens.append(len(query.pattern) + context_after)
+
+        # the number of bytes at the end of each chunk that are copied to the
+        # beginning of the buffer before reading the next chunk, which is
+        # enough to hold any match, and its context, that spans the two chunks
+        overlap = max(match_lens) - 1
+        if overlap < 0:
+            overlap = 0
+
+        # create the buffer if it has not been allocated yet; it must be large
+        # enough that each read fills a good portion of it after the overlap
         # NOTE: don't use a larger buffer size because reading from stdin in
         # Windows will raise IOError if the buffer is too large... ugh
         if buffer is None:
-            buffer_size = (len(self.pattern) * 2) + self.context_after
+            buffer_size = overlap * 2
             if buffer_size < 16384:
                 buffer_size = 16384
             buffer = bytearray(buffer_size)
+        buffer_view = memoryview(buffer)
 
-        # read the bytes from the files and search for pattern matches
+        # the offset in the file from which each query's next match may start,
+        # which prevents re-reporting matches in the overlapping bytes
+        next_match_offsets = [0] * len(queries)
+
+        # read the bytes from the file and search for pattern matches; the
+        # first "carried" bytes of the buffer are those copied from the end of
+        # the previous chunk
         buffer_offset = 0
-        size = f.readinto(buffer)
-        while size > 0:
-            last_match_end = -1
-
-            # search for complete matches inside the chunk of bytes
-            index = buffer.find(self.pattern, 0, size)
-            while index >= 0:
-                # extract the matching text, and some context, from the bytes
-                s_end = index + len(self.pattern) + self.context_after
-                if s_end > size:
-                    s_end = size
-                s = buffer[index:s_end]
-                match_offset = buffer_offset + index
-                self.on_match_found(path, s, match_offset)
-
-                # see if there are more matches in this line
-                index += len(self.pattern)
-                last_match_end = index
-                index = buffer.find(self.pattern, index, size)
-
-            # check for a partial match at the end of the bytes as the match
-            # may span this chunk and the next chunk; if found, copy the
-            # potentially-matching bytes to the beginning of the buffer and set
-            # up the next read to write into the buffer after the potentially-
-            # matching chunk; the last_match_end check is to fix the boundary
-            # conditional where the last match detected above was exactly the
-            # last chunk of bytes in the buffer
-            next_read_buffer = buffer
-            size_adjust = 0
-            if last_match_end < size:
-                check = self.pattern
-                while check:
-                    if buffer.endswith(check, 0, size):
-                        buffer[0:len(check)] = buffer[size - len(check):size]
-                        size_adjust = len(check)
-                        next_read_buffer = memoryview(buffer)[size_adjust:]
-                        break
-                    check = check[:-1]
-
-            # read the next chunk of bytes
-            buffer_offset += size - size_adjust
-            size = f.readinto(next_read_buffer)
-            size += size_adjust
+        carried = 0
+        while True:
+            size = f.readinto(buffer_view[carried:])
+            at_eof = (size == 0)
+            size += carried
+
+            for (query_index, query) in enumerate(queries):
+                pattern = query.pattern
+                pattern_len = len(pattern)
+                match_len = match_lens[query_index]
+
+                start = next_match_offsets[query_index] - buffer_offset
+                if start < 0:
+                    start = 0
+
+                # search for complete matches inside the chunk of bytes; a
+                # match whose context extends past the end of the chunk is
+                # left to be reported after the next chunk has been read,
+                # unless there are no more chunks to read
+                index = buffer.find(pattern, start, size)
+                while index >= 0:
+                    s_end = index + match_len
+                    if s_end > size:
+                        if not at_eof:
+                            break
+                        s_end = size
+
+                    # extract the matching text, and some context, from the
+                    # bytes
+                    s = buffer[index:s_end]
+                    match_offset = buffer_offset + index
+                    self.on_match_found(query, path, s, match_offset)
+
+                    # see if there are more matches in this chunk
+                    index += pattern_len
+                    next_match_offsets[query_index] = buffer_offset + index
+                    index = buffer.find(pattern, index, size)
+
+            if at_eof:
+                break
+
+            # copy the last bytes of the chunk to the beginning of the buffer
+            # so that the next chunk is read into the buffer after them
+            carried = overlap
+            if carried > size:
+                carried = size
+            buffer[0:carried] = buffer[size - carried:size]
+            buffer_offset += size - carried
 
         # return the buffer so that the caller can re-use it in the future
         return buffer
 
 
+    def _find_input_file(self, file_ids):
+        """
+        Searches the files given explicitly to self.files, either as paths, as
+        glob patterns, or as its default, for one with the given identifiers.
+        Files in directories given to self.files are not searched.
+        *file_ids* must be a collection of file identifiers, as returned from
+        _get_file_id(), for which to search.
+        Returns the path of the first file found, or None if none were found.
+        """
+        if not file_ids:
+            return None
+
+        files = self.files
+        if not files.paths:
+            if self._get_file_id(files.default) in file_ids:
+                return files.default_path
+            return None
+
+        for pattern in files.paths:
+            if FileIterator.has_glob_magic(pattern):
+                import glob
+                paths = glob.iglob(pattern)
+            else:
+                paths = [pattern]
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if (st.st_dev, st.st_ino) in file_ids:
+                    return path
+
+        return None
+
+
+    @staticmethod
+    def _get_file_id(f):
+        """
+        Returns an object that uniquely identifies the file underlying the
+        given file object, such that two file objects have equal identifiers if
+        and only if they refer to the same file, even via different paths.
+        *f* must be a file object.
+        Returns None if the file cannot be identified, such as if the given
+        object is not backed by a file descriptor.
+        """
+        try:
+            st = os.fstat(f.fileno())
+        except (AttributeError, OSError, ValueError):
+            return None
+        return (st.st_dev, st.st_ino)
+
+
     def log_debug(self, message):
         """
         Logs a debug message to self.logger.
@@ -260,15 +603,17 @@ class BgrepApplication:
             logger.debug(message)
 
 
-    def on_match_found(self, path, s, byte_offset):
-        stdout = self.stdout
+    def on_match_found(self, query, path, s, byte_offset):
+        stdout = self._outputs.get(query.output_path)
+        if stdout is None:
+            stdout = self.stdout
         if stdout is None:
             stdout = sys.stdout
 
         # replace non-printable ASCII characters, except those that are part of
         # the pattern
         i = len(s) - 1
-        while i >= len(self.pattern):
+        while i >= len(query.pattern):
             if s[i] < 32 or s[i] > 126:
                 s[i] = 32 # 32 is the ASCII code for space
             i -= 1
@@ -284,7 +629,38 @@ class BgrepApplication:
 
         s_str = s.decode("US-ASCII", errors="replace")
         message = "{}{}".format(prefix, s_str)
-        print(message, file=stdout)
+
+        # report write errors, such as a full disk, as errors rather than
+        # letting them be mistaken for errors reading the file being searched
+        try:
+            print(message, file=stdout)
+        except IOError as e:
+            output_path = query.output_path
+            if output_path is None:
+                output_path = "standard output"
+            raise self.Error("unable to write to {}: {}"
+                .format(output_path, e))
+
+
+    class Query:
+        """
+        Stores a single search performed by the application.
+        """
+
+        def __init__(self, pattern, context_after=20, output_path=None):
+            """
+            Initializes a new instance of Query.
+            *pattern* must be a byte string whose value to search for.
+            *context_after* must be an integer whose value is the number of
+            bytes after a match to include in the output; the default is 20.
+            *output_path* must be a string whose value is the path of the file
+            to which to write the matches, which will be overwritten; may be
+            None (the default) to write the matches to the application's
+            standard output stream.
+            """
+            self.pattern = pattern
+            self.context_after = context_after
+            self.output_path = output_path
 
 
     class Error(Exception):
@@ -301,13 +677,11 @@ class FileIterator:
     glob wildcard patterns.
     """
 
-    GLOB_MAGIC_RE = re.compile("[*?[]")
+    GLOB_MAGIC_CHARS = "*?["
     """
-    Regular expression that matches glob-style wildcards in a string.
-    This pattern can be used to determine if a path contains glob-style
-    wildcards or is just a flat path.
-    This regular expression was copied from the glob module, so it should only
-    be used as a *hint*, not an absolute truth.
+    The characters that denote glob-style wildcards in a string.
+    These characters were copied from the glob module, so they should only be
+    used as a *hint*, not an absolute truth.
     """
 
     def __init__(self, paths=None, default=None, default_path=None):
@@ -362,6 +736,19 @@ class FileIterator:
         pass
 
 
+    @classmethod
+    def has_glob_magic(cls, path):
+        """
+        Returns whether or not the given path contains glob-style wildcards, as
+        opposed to being just a flat path.
+        *path* must be a string whose value is the path to check.
+        """
+        for c in cls.GLOB_MAGIC_CHARS:
+            if c in path:
+                return True
+        return False
+
+
     def _iter_pattern(self, pattern):
         """
         Called during iteration to return the FileInfo objects corresponding
@@ -370,8 +757,15 @@ class FileIterator:
         pattern; all matching files and files in all matching directories,
         recursively, will be yielded.
         """
-        # perform the glob pattern matching
-        glob_matches = glob.iglob(pattern)
+        # perform the glob pattern matching; flat paths are simply checked for
+        # existence, just like glob does, to avoid importing the glob module
+        if self.has_glob_magic(pattern):
+            import glob
+            glob_matches = glob.iglob(pattern)
+        elif os.path.lexists(pattern):
+            glob_matches = iter([pattern])
+        else:
+            glob_matches = iter([])
 
         # make sure there is at least one match
         try:
@@ -439,236 +833,347 @@ class FileIterator:
 
 ################################################################################
 
-class ArgumentParser(argparse.ArgumentParser):
+class LazyLogger:
     """
-    Parses the command-line arguments for the bgrep application.
+    A logger that defers importing the logging module and installing the log
+    handler until the first message is logged that is not filtered out by the
+    log level.
     """
 
-    USAGE = "%(prog)s [options] <pattern> [path [path ...]]"
+    def __init__(self, stream=None, level=LOG_LEVEL_NORMAL):
+        """
+        Initializes a new instance of this class.
+        *stream* must be a file-like object opened in text mode to which log
+        messages are to be written; may be None (the default) to use
+        sys.stderr.
+        *level* must be an integer whose value is the log level; messages
+        logged with a lower level are discarded; the default is
+        LOG_LEVEL_NORMAL.
+        """
+        self.stream = stream
+        self.level = level
+        self._logger = None
 
-    DESCRIPTION = "Search for binary strings in binary files."
 
-    def __init__(self, prog=None, stdout=None, stderr=None, stdin=None):
+    def debug(self, message):
         """
-        Initializes a new instance of MyArgumentParser.
-        *prog* must be a string whose value is the name of the program to
-        present to the user; may be None (the default) to have the superclass
-        choose an appropriate default.
-        *stdout* must be a file-like object opened in text mode to use as the
-        standard output stream; may be None (the default) to use a stream chosen
-        by each use, which is usually sys.stdout.
-        *stderr* must be a file-like object opened in text mode to use as the
-        standard output stream; may be None (the default) to use a stream chosen
-        by each use, which is usually sys.stderr.
-        *stdin* must be a file-like object opened in text mode to use as the
-        standard input stream; may be None (the default) to use a stream chosen
-        by each use, which is usually sys.stdin.
-        """
-        super().__init__(prog=prog, usage=self.USAGE,
-            description=self.DESCRIPTION)
-        self.stdout = stdout
-        self.stderr = stderr
-        self.stdin = stdin
-        self.default_log_level = logging.INFO
-        self._add_arguments()
+        Logs the given message with level LOG_LEVEL_VERBOSE.
+        """
+        self.log(LOG_LEVEL_VERBOSE, message)
+
+
+    def warning(self, message):
+        """
+        Logs the given message with level LOG_LEVEL_QUIET.
+        """
+        self.log(LOG_LEVEL_QUIET, message)
+
+
+    def log(self, level, message):
+        """
+        Logs the given message with the given level, creating the underlying
+        logging.Logger if this is the first message to be logged.
+        """
+        if level < self.level:
+            return
+
+        logger = self._logger
+        if logger is None:
+            import logging
+            handler = logging.StreamHandler(stream=self.stream)
+            formatter = logging.Formatter()
+            handler.setFormatter(formatter)
+            logger = logging.getLogger()
+            logger.addHandler(handler)
+            logger.setLevel(self.level)
+            self._logger = logger
+
+        logger.log(level, message)
+
+################################################################################
+
+# the ArgumentParser class defined by load_argument_parser(), or None if it has
+# not been invoked yet
+_argument_parser_class = None
 
 
-    def _add_arguments(self):
+def load_argument_parser():
+    """
+    Imports the argparse module and defines the ArgumentParser class, which
+    is not done at import time because doing so is relatively expensive and is
+    not needed for the simple command-line forms handled directly by main().
+    The class is only defined on the first invocation; subsequent invocations
+    return the same class.
+    Returns the ArgumentParser class.
+    """
+    global _argument_parser_class
+    if _argument_parser_class is not None:
+        return _argument_parser_class
+
+    import argparse
+
+    class ArgumentParser(argparse.ArgumentParser):
         """
-        Adds the arguments to this object.
+        Parses the command-line arguments for the bgrep application.
         """
 
-        self.add_argument("pattern",
-            help="""The string to search for. This string will be converted to
-            bytes using ASCII encoding and the resulting byte string will be
-            searched for in the given paths."""
-        )
+        USAGE = ("%(prog)s [options] <pattern> [path [path ...]]\n"
+            "       %(prog)s [options] --queries <file> [path [path ...]]")
+
+        DESCRIPTION = "Search for binary strings in binary files."
 
-        self.add_argument("paths",
-            nargs="*",
-            metavar="path",
-            help="""The path of a file and/or directory to search.
-            Unix glob patterns, such as "*", "?", and "[...]", are recognized.
-            Directories will be searched recursively.
-            If no paths are specified then standard input is searched.
+        def __init__(self, prog=None, stdout=None, stderr=None, stdin=None):
             """
-        )
+            Initializes a new instance of MyArgumentParser.
+            *prog* must be a string whose value is the name of the program to
+            present to the user; may be None (the default) to have the
+            superclass choose an appropriate default.
+            *stdout* must be a file-like object opened in text mode to use as
+            the standard output stream; may be None (the default) to use a
+            stream chosen by each use, which is usually sys.stdout.
+            *stderr* must be a file-like object opened in text mode to use as
+            the standard output stream; may be None (the default) to use a
+            stream chosen by each use, which is usually sys.stderr.
+            *stdin* must be a file-like object opened in text mode to use as the
+            standard input stream; may be None (the default) to use a stream
+            chosen by each use, which is usually sys.stdin.
+            """
+            super().__init__(prog=prog, usage=self.USAGE,
+                description=self.DESCRIPTION)
+            self.stdout = stdout
+            self.stderr = stderr
+            self.stdin = stdin
+            self.default_log_level = LOG_LEVEL_NORMAL
+            self._add_arguments()
 
-        self.add_argument("-c", "--context-after",
-            type=int,
-            default=20,
-            help="""The number of bytes after a match to print
-            (default: %(default)i"""
-        )
 
-        self.add_argument("-b", "--print-byte-offsets",
-            action="store_true",
-            default=False,
-            help="""Print the byte offset at which each match occurs"""
-        )
+        def _add_arguments(self):
+            """
+            Adds the arguments to this object.
+            """
 
-        self.add_argument("--version",
-            action="version",
-            version=VERSION,
-            help="""Print the version of this application and exit."""
-        )
+            self.add_argument("pattern",
+                nargs="?",
+                help="""The string to search for. This string will be converted
+                to bytes using ASCII encoding and the resulting byte string will
+                be searched for in the given paths. Must not be specified if
+                --queries is specified."""
+            )
 
-        log_group = self.add_argument_group("logging options")
+            self.add_argument("paths",
+                nargs="*",
+                metavar="path",
+                help="""The path of a file and/or directory to search.
+                Unix glob patterns, such as "*", "?", and "[...]", are
+                recognized. Directories will be searched recursively.
+                If no paths are specified then standard input is searched.
+                """
+            )
 
-        arg_log_level_verbose = log_group.add_argument("-v", "--verbose",
-            dest="log_level",
-            action="store_const",
-            const=logging.DEBUG,
-            help="""Set the log level to "verbose", which causes a great deal
-            of extra information to be logged to standard error."""
-        )
+            self.add_argument("-c", "--context-after",
+                type=self._non_negative_int,
+                default=20,
+                help="""The number of bytes after a match to print
+                (default: %(default)i"""
+            )
 
-        arg_log_level_quiet = log_group.add_argument("-q", "--quiet",
-            dest="log_level",
-            action="store_const",
-            const=logging.WARNING,
-            help="""Set the log level to "warning", which causes only warning
-            messages to be logged to standard error."""
-        )
+            self.add_argument("-b", "--print-byte-offsets",
+                action="store_true",
+                default=False,
+                help="""Print the byte offset at which each match occurs"""
+            )
 
-        other_log_levels = []
-        for option in (arg_log_level_verbose, arg_log_level_quiet):
-            other_log_levels.extend(option.option_strings)
-        other_log_levels_str = ", ".join(other_log_levels)
+            self.add_argument("--queries",
+                dest="queries_path",
+                metavar="file",
+                help="""Read the strings to search for from the given file
+                instead of from the command line, searching for all of them
+                while reading each file only once. Each line of the file is one
+                query, consisting of up to three tab-separated fields: the
+                string to search for, the number of bytes after a match to print
+                (default: the value of --context-after), and the path of the
+                file to which to write the matches (default: standard
+                output). No two queries may write to the same output, so that
+                the matches of different queries are never mixed together."""
+            )
 
-        arg_log_level_normal = log_group.add_argument("--log-level-normal",
-            dest="log_level",
-            action="store_const",
-            const=self.default_log_level,
-            help="""Set the log level to "default"; the primary purpose of this
-            argument is to override any previous specification of {}."""
-            .format(other_log_levels_str)
-        )
+            self.add_argument("--version",
+                action="version",
+                version=VERSION,
+                help="""Print the version of this application and exit."""
+            )
 
+            log_group = self.add_argument_group("logging options")
 
-    def parse_args(self, args):
-        """
-        Parses the given line arguments.
-        *args* must be an iterable of strings whose values are the arguments
-        to parse; may be None (the default) to use the default value chosen by
-        the superclass.
-        Returns a newly-created instance of BgrepApplication that, when run,
-        will behave in the manner described by the given arguments.
-        Raises Error if parsing the given arguments fails.
-        """
-        if args is not None:
-            args = tuple(args) # create a local copy
-        namespace = self.Namespace()
-        super().parse_args(args=args, namespace=namespace)
-        app = namespace.create_application(parser=self)
-        return app
+            arg_log_level_verbose = log_group.add_argument("-v", "--verbose",
+                dest="log_level",
+                action="store_const",
+                const=LOG_LEVEL_VERBOSE,
+                help="""Set the log level to "verbose", which causes a great
+                deal of extra information to be logged to standard error."""
+            )
 
+            arg_log_level_quiet = log_group.add_argument("-q", "--quiet",
+                dest="log_level",
+                action="store_const",
+                const=LOG_LEVEL_QUIET,
+                help="""Set the log level to "warning", which causes only
+                warning messages to be logged to standard error."""
+            )
 
-    def exit(self, status=EXIT_SUCCESS, message=None):
-        """
-        Overrides the exit behaviour defined in the superclass to instead raise
-        Error using the given *message* and *status* as the *message* and
-        *exit_code* parameters to the exception's initializer, respectively.
-        """
-        raise self.Error(message=message, exit_code=status)
+            other_log_levels = []
+            for option in (arg_log_level_verbose, arg_log_level_quiet):
+                other_log_levels.extend(option.option_strings)
+            other_log_levels_str = ", ".join(other_log_levels)
+
+            arg_log_level_normal = log_group.add_argument("--log-level-normal",
+                dest="log_level",
+                action="store_const",
+                const=self.default_log_level,
+                help="""Set the log level to "default"; the primary purpose of
+                this argument is to override any previous specification of
+                {}."""
+                .format(other_log_levels_str)
+            )
 
 
-    def error(self, message):
-        """
-        Overrides the error behaviour defined in the superclass to instead
-        invoke exit() with status=EXIT_ARGS and the given message, which will
-        raise Error with these values.
-        """
-        self.exit(status=EXIT_ARGS, message=message)
+        @staticmethod
+        def _non_negative_int(value):
+            """
+            Converts the given string to an integer for use as the *type* of
+            arguments that must not be negative.
+            Raises argparse.ArgumentTypeError if the given string is not a
+            non-negative integer.
+            """
+            try:
+                result = int(value)
+            except ValueError:
+                result = -1
+            if result < 0:
+                raise argparse.ArgumentTypeError(
+                    "invalid non-negative integer: {}".format(value))
+            return result
 
 
-    def print_help(self):
-        """
-        Overrides the print_help behaviour defined in the superclass to print
-        to the stdout stream given to __init__() instead of sys.stdout.
-        """
-        super().print_help(file=self.stdout)
+        def parse_args(self, args):
+            """
+            Parses the given line arguments.
+            *args* must be an iterable of strings whose values are the arguments
+            to parse; may be None (the default) to use the default value chosen
+            by the superclass.
+            Returns a newly-created instance of BgrepApplication that, when run,
+            will behave in the manner described by the given arguments.
+            Raises Error if parsing the given arguments fails.
+            """
+            if args is not None:
+                args = tuple(args) # create a local copy
+            namespace = self.Namespace()
+            super().parse_args(args=args, namespace=namespace)
+            app = namespace.create_application(parser=self)
+            return app
 
 
-    class Namespace(argparse.Namespace):
-        """
-        The custom Namespace used when parsing arguments.
-        """
+        def exit(self, status=EXIT_SUCCESS, message=None):
+            """
+            Overrides the exit behaviour defined in the superclass to instead
+            raise Error using the given *message* and *status* as the *message*
+            and *exit_code* parameters to the exception's initializer,
+            respectively.
+            """
+            raise self.Error(message=message, exit_code=status)
 
-        def create_application(self, parser):
+
+        def error(self, message):
             """
-            Creates and returns a new instance of BgrepApplication based on the
-            given arguments.
-            *parser* must be an instance of ArgumentParser, whose attributes
-            may be used when creating the application.
+            Overrides the error behaviour defined in the superclass to instead
+            invoke exit() with status=EXIT_ARGS and the given message, which
+            will raise Error with these values.
             """
-            pattern = self.pattern.encode("US-ASCII", errors="ignore")
+            self.exit(status=EXIT_ARGS, message=message)
 
-            stdout = parser.stdout
-            stdin = parser.stdin
-            if stdin is not None:
-                stdin = stdin.buffer # use the underlying binary stream
 
-            # initialize the logging framework
-            handler = logging.StreamHandler(stream=parser.stderr)
-            formatter = logging.Formatter()
-            handler.setFormatter(formatter)
-            logger = logging.getLogger()
-            logger.addHandler(handler)
-            log_level = self.log_level
-            if log_level is None:
-                log_level = parser.default_log_level
-            logger.setLevel(log_level)
-
-            # setup the iterator over the files to search
-            class MyFileIterator(FileIterator):
-                def on_error(self, path, pattern, error):
-                    message = "unable to read {}: {}".format(path, error)
-                    logger.warning("WARNING: {}".format(message))
-
-            paths = tuple(self.paths)
-            files = MyFileIterator(paths, default=stdin,
-                default_path="<standard input>")
-
-            # enable print_filenames if more than one file is being searched
-            # or if a path with glob-style wildcards was given
-            num_explicit_paths = len(paths)
-            if num_explicit_paths < 1:
-                print_filenames = False # reading from standard input
-            elif num_explicit_paths > 1:
-                print_filenames = True
-            else:
-                first_path = paths[0]
-                match = FileIterator.GLOB_MAGIC_RE.search(first_path)
-                print_filenames = (match is not None)
-
-            return BgrepApplication(
-                pattern=pattern,
-                files=files,
-                print_filenames=print_filenames,
-                context_after=self.context_after,
-                print_byte_offsets=self.print_byte_offsets,
-                stdout=stdout,
-                stdin=stdin,
-                logger=logger,
-            )
+        def print_help(self):
+            """
+            Overrides the print_help behaviour defined in the superclass to
+            print to the stdout stream given to __init__() instead of
+            sys.stdout.
+            """
+            super().print_help(file=self.stdout)
 
 
-    class Error(Exception):
-        """
-        Exception raised when parsing the arguments fails.
-        """
+        class Namespace(argparse.Namespace):
+            """
+            The custom Namespace used when parsing arguments.
+            """
 
-        def __init__(self, message, exit_code):
+            def create_application(self, parser):
+                """
+                Creates and returns a new instance of BgrepApplication based on
+                the given arguments.
+                *parser* must be an instance of ArgumentParser, whose attributes
+                may be used when creating the application.
+                """
+                log_level = self.log_level
+                if log_level is None:
+                    log_level = parser.default_log_level
+
+                # with --queries, there is no pattern argument and so the first
+                # positional argument, if any, is actually a path
+                pattern = self.pattern
+                paths = self.paths
+                queries_path = self.queries_path
+                if queries_path is None:
+                    if pattern is None:
+                        parser.error("the following arguments are required: "
+                            "pattern")
+                    queries = None
+                else:
+                    if pattern is not None:
+                        paths = [pattern] + paths
+                        pattern = None
+                    try:
+                        queries = read_queries(queries_path,
+                            context_after=self.context_after)
+                    except (IOError, ValueError) as e:
+                        parser.exit(status=EXIT_ERROR,
+                            message="unable to read queries from {}: {}"
+                            .format(queries_path, e))
+                    if not queries:
+                        parser.exit(status=EXIT_ERROR,
+                            message="no queries in {}".format(queries_path))
+
+                return create_application(
+                    pattern=pattern,
+                    paths=paths,
+                    context_after=self.context_after,
+                    print_byte_offsets=self.print_byte_offsets,
+                    log_level=log_level,
+                    stdout=parser.stdout,
+                    stderr=parser.stderr,
+                    stdin=parser.stdin,
+                    queries=queries,
+                )
+
+
+        class Error(Exception):
             """
-            Initializes a new instance of this class.
-            *message* must be a string whose value is a message for this object.
-            *exit_code* must be an integer equal to one of EXIT_SUCCESS,
-            EXIT_ERROR, or EXIT_ARGS, and will be stored in the *exit_code*
-            attribute of this object.
+            Exception raised when parsing the arguments fails.
             """
-            super().__init__(message)
-            self.exit_code = exit_code
+
+            def __init__(self, message, exit_code):
+                """
+                Initializes a new instance of this class.
+                *message* must be a string whose value is a message for this
+                object.
+                *exit_code* must be an integer equal to one of EXIT_SUCCESS,
+                EXIT_ERROR, or EXIT_ARGS, and will be stored in the *exit_code*
+                attribute of this object.
+                """
+                super().__init__(message)
+                self.exit_code = exit_code
+
+    _argument_parser_class = ArgumentParser
+    return ArgumentParser
 
 ################################################################################
 
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+
+################################################################################
+#
+# check_search.py - check the matches reported by bgrep.py against a reference
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+"""
+Checks that BgrepApplication.search() reports exactly the matches, and the
+context after them, that a simple scan of the entire file would report, for
+random data searched with several queries at once.  The data is read both in
+full chunks and in random short reads, to exercise matches that span the
+chunks read from the file.
+
+Usage: check_search.py [num_iterations [seed]]
+
+Exits with status 0 if all checks pass or 1 if any check fails.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bgrep
+
+################################################################################
+
+DEFAULT_NUM_ITERATIONS = 100
+
+################################################################################
+
+def main():
+    num_iterations = DEFAULT_NUM_ITERATIONS
+    if len(sys.argv) > 1:
+        num_iterations = int(sys.argv[1])
+    seed = 0
+    if len(sys.argv) > 2:
+        seed = int(sys.argv[2])
+
+    rng = random.Random(seed)
+    num_failures = 0
+    for iteration in range(num_iterations):
+        (data, queries) = create_case(rng)
+        for short_reads in (False, True):
+            f = ShortReadFile(data, rng if short_reads else None)
+            actual = search(f, queries)
+            expected = reference_search(data, queries)
+            if actual != expected:
+                num_failures += 1
+                print("FAILED: iteration {} (seed {}, data length {}, "
+                    "short reads {}, queries {})".format(iteration, seed,
+                    len(data), short_reads,
+                    [(q.pattern, q.context_after) for q in queries]))
+
+    if num_failures:
+        print("{} of {} checks failed".format(num_failures,
+            num_iterations * 2))
+        return 1
+
+    print("all {} checks passed".format(num_iterations * 2))
+    return 0
+
+
+def create_case(rng):
+    """
+    Creates random data and queries to search for in it, using a small
+    alphabet so that matches, including overlapping matches and matches that
+    span the chunks read from the file, are frequent.
+    Returns a tuple (data, queries).
+    """
+    alphabet = b"ab"
+    data_len = rng.choice((0, 1, 10, 16383, 16384, 16385, 50000, 100000))
+    data = bytes(rng.choice(alphabet) for i in range(data_len))
+
+    queries = []
+    for i in range(rng.randint(1, 4)):
+        pattern_len = rng.choice((1, 2, 4, 8, 17))
+        pattern = bytes(rng.choice(alphabet) for j in range(pattern_len))
+        context_after = rng.choice((0, 3, 20, 300, 20000))
+        queries.append(bgrep.BgrepApplication.Query(pattern,
+            context_after=context_after))
+
+    # make the data end with the beginning of the first pattern, which is an
+    # edge case for matches spanning chunks
+    if data and rng.random() < 0.25:
+        prefix = queries[0].pattern[:-1]
+        data = data[:len(data) - len(prefix)] + prefix
+
+    return (data, queries)
+
+
+def search(f, queries):
+    """
+    Searches the given file using BgrepApplication.search() and returns the
+    matches that it reported, as a list of (query_index, offset, bytes)
+    tuples sorted by query index, in the order reported.
+    """
+    matches = []
+    query_indexes = {id(query): i for (i, query) in enumerate(queries)}
+
+    class MyBgrepApplication(bgrep.BgrepApplication):
+        def on_match_found(self, query, path, s, byte_offset):
+            matches.append((query_indexes[id(query)], byte_offset, bytes(s)))
+
+    app = MyBgrepApplication(queries=queries)
+    app.search(f, "<data>")
+    matches.sort(key=lambda match: match[0])
+    return matches
+
+
+def reference_search(data, queries):
+    """
+    Searches the given data in its entirety for non-overlapping matches of
+    the given queries and returns them in the same form as search().
+    """
+    matches = []
+    for (query_index, query) in enumerate(queries):
+        pattern = query.pattern
+        index = data.find(pattern)
+        while index >= 0:
+            s_end = index + len(pattern) + query.context_after
+            matches.append((query_index, index, data[index:s_end]))
+            index = data.find(pattern, index + len(pattern))
+    return matches
+
+################################################################################
+
+class ShortReadFile:
+    """
+    A binary file-like object that reads from a byte string and, optionally,
+    returns fewer bytes from readinto() than requested, like reading from a
+    pipe may do.
+    """
+
+    def __init__(self, data, rng=None):
+        """
+        Initializes a new instance of this class.
+        *data* must be a byte string whose value is the data to read.
+        *rng* must be a random.Random object used to choose the number of
+        bytes returned from each readinto(); may be None (the default) to fill
+        the given buffer whenever enough data remains.
+        """
+        self.data = data
+        self.rng = rng
+        self.offset = 0
+
+
+    def readinto(self, buffer):
+        size = len(buffer)
+        remaining = len(self.data) - self.offset
+        if size > remaining:
+            size = remaining
+        if self.rng is not None and size > 0:
+            size = self.rng.randint(1, size)
+        buffer[0:size] = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return size
+
+################################################################################
+
+if __name__ == "__main__":
+    sys.exit(main())